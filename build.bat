@@ -8,10 +8,6 @@ if %ERRORLEVEL% NEQ 0 (
     python -m pip install pyinstaller
 )
 
-REM Ensure eventlet is installed
-echo Installing/checking eventlet...
-python -m pip install eventlet
-
 REM Create executable with dependencies
 echo Creating executable...
 python -m PyInstaller ^
@@ -25,25 +21,19 @@ python -m PyInstaller ^
     --hidden-import flask_socketio ^
     --hidden-import socketio ^
     --hidden-import engineio ^
-    --hidden-import eventlet ^
-    --hidden-import eventlet.wsgi ^
-    --hidden-import eventlet.green ^
-    --hidden-import eventlet.green.threading ^
-    --hidden-import eventlet.green.socket ^
-    --hidden-import eventlet.green.ssl ^
     --hidden-import gevent ^
     --hidden-import gevent.socket ^
     --hidden-import gevent.threading ^
     --hidden-import threading ^
     --hidden-import queue ^
-    --hidden-import engineio.async_drivers.eventlet ^
     --hidden-import engineio.async_drivers.threading ^
-    --hidden-import socketio.async_drivers.eventlet ^
     --hidden-import socketio.async_drivers.threading ^
+    --hidden-import simple_websocket ^
     --hidden-import dns.resolver ^
     --collect-all flask_socketio ^
     --collect-all socketio ^
     --collect-all engineio ^
+    --collect-all watchdog ^
     server.py
 
 if %ERRORLEVEL% EQU 0 (
@@ -4,22 +4,47 @@ A web-based SFX player that works with any streaming software supporting browser
 """
 
 import os
+import re
 import sys
 import json
+import base64
 import time
 import uuid
+import hashlib
+import queue
+import atexit
 import logging
+import logging.handlers
+import functools
 import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
+from werkzeug.security import safe_join
 from mutagen.mp3 import MP3
 
+# Optional: orjson parses config.json faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: watchdog keeps the local library index current without rescanning
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
 # Determine base path (works for both script and PyInstaller exe)
 if getattr(sys, 'frozen', False):
     BASE_DIR = Path(sys.executable).parent
@@ -29,11 +54,18 @@ else:
 # Load configuration
 CONFIG_PATH = BASE_DIR / "config.json"
 
+def read_config() -> Dict[str, Any]:
+    """Read and parse config.json (raises on missing file or invalid JSON)"""
+    with open(CONFIG_PATH, "rb") as f:
+        data = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 def load_config() -> Dict[str, Any]:
-    """Load configuration from config.json"""
+    """Load configuration from config.json, exiting if it can't be read"""
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_config()
     except FileNotFoundError:
         print(f"ERROR: config.json not found at {CONFIG_PATH}")
         sys.exit(1)
@@ -43,8 +75,14 @@ def load_config() -> Dict[str, Any]:
 
 CONFIG = load_config()
 
+# Serializes /reload-config. CONFIG is only ever replaced as a whole dict, so
+# readers stay lock-free; take a local reference (config = CONFIG) when
+# reading several values so they all come from the same version.
+CONFIG_LOCK = threading.RLock()
+
 # Directory paths
 AUDIO_CACHE_DIR = BASE_DIR / "audio_cache"
+AUDIO_META_DIR = AUDIO_CACHE_DIR / "meta"  # duration sidecars, kept out of sfx_library
 SFX_LIBRARY_DIR = BASE_DIR / "sfx_library"
 LOGS_DIR = BASE_DIR / "logs"
 TEMPLATES_DIR = BASE_DIR / "templates"
@@ -52,19 +90,29 @@ STATIC_DIR = BASE_DIR / "static"
 
 # Ensure directories exist
 AUDIO_CACHE_DIR.mkdir(exist_ok=True)
+AUDIO_META_DIR.mkdir(exist_ok=True)
 SFX_LIBRARY_DIR.mkdir(exist_ok=True)
 LOGS_DIR.mkdir(exist_ok=True)
 
 # Setup logging
 LOG_FILE = BASE_DIR / CONFIG.get("logging", {}).get("log_file", "logs/sfx_log.txt")
+log_handlers = [
+    logging.FileHandler(LOG_FILE, encoding='utf-8'),
+    logging.StreamHandler()
+] if CONFIG.get("logging", {}).get("enabled", True) else [logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+# Request threads only enqueue log records; a background listener does the
+# file and console writes so disk latency stays off the trigger path
+log_listener = logging.handlers.QueueListener(queue.Queue(), *log_handlers, respect_handler_level=True)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ] if CONFIG.get("logging", {}).get("enabled", True) else [logging.StreamHandler()]
+    format='%(message)s',  # Final formatting happens in the listener's handlers
+    handlers=[logging.handlers.QueueHandler(log_listener.queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Flask app setup
@@ -73,14 +121,18 @@ app = Flask(__name__,
             static_folder=str(STATIC_DIR))
 app.config['SECRET_KEY'] = str(uuid.uuid4())
 CORS(app)
+SOCKETIO_PING_TIMEOUT = 60
+WIDGET_ROOM = "widgets"  # play_sfx is only sent to overlay widgets
 # Initialize SocketIO with maximum compatibility
 try:
-    # Simple initialization without specifying async_mode
+    # Threading mode: play_sfx is emitted from worker threads, which only
+    # reaches clients when the server itself runs on OS threads
     socketio = SocketIO(app, 
+                       async_mode="threading",
                        cors_allowed_origins="*",
                        logger=False, 
                        engineio_logger=False,
-                       ping_timeout=60,
+                       ping_timeout=SOCKETIO_PING_TIMEOUT,
                        ping_interval=25)
     logger.info("SocketIO initialized successfully")
 except Exception as e:
@@ -97,8 +149,107 @@ except Exception as e:
 # Global state
 last_play_time: float = 0
 
+class ClientRegistry:
+    """Thread-safe set of connected WebSocket sids with an O(1) count"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connected_at: Dict[str, float] = {}
+        self.count = 0
+    
+    def add(self, sid: str):
+        with self._lock:
+            self._connected_at[sid] = time.monotonic()
+            self.count = len(self._connected_at)
+    
+    def discard(self, sid: str):
+        with self._lock:
+            self._connected_at.pop(sid, None)
+            self.count = len(self._connected_at)
+    
+    def sweep(self, is_connected, min_age: float) -> int:
+        """Drop sids older than min_age that the socket server no longer knows about"""
+        cutoff = time.monotonic() - min_age
+        with self._lock:
+            stale = [sid for sid, connected_at in self._connected_at.items()
+                     if connected_at < cutoff and not is_connected(sid)]
+            for sid in stale:
+                del self._connected_at[sid]
+            self.count = len(self._connected_at)
+        return len(stale)
+    
+    def __len__(self) -> int:
+        return self.count
+
+
 # Track connected clients
-connected_clients: set = set()
+connected_clients = ClientRegistry()
+
+# Cached local library listing. Kept current by a watchdog observer when
+# available, otherwise invalidated when the directory mtime changes
+library_cache: Dict[str, Any] = {"mtime": None, "files": {}}
+library_cache_lock = threading.RLock()
+library_observer = None
+
+# Shared HTTP session so ElevenLabs calls reuse pooled keep-alive connections
+# (connect errors and gateway failures are retried; read timeouts are not,
+# since the generation may already have been billed)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update({"Content-Type": "application/json"})
+HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3,
+                      status_forcelist=[502, 503, 504],
+                      allowed_methods=["POST"],
+                      raise_on_status=False)
+))
+
+# Background cache cleanup: runs every 30 minutes, deleting at most one batch
+# per pass and pacing deletes to a bytes-per-second budget
+CLEANUP_INTERVAL_SECONDS = 1800
+CLEANUP_BACKLOG_DELAY = 5
+CLEANUP_BATCH_SIZE = 200
+CLEANUP_BYTES_PER_SECOND = 16 * 1024 * 1024
+
+# Bound concurrent ElevenLabs calls; after a 429 calls are serialized until the
+# throttle window passes so bursts don't burn quota on rejected requests.
+# Replaced on /reload-config; calls already holding the old one finish under it.
+def create_api_semaphore(config: Dict[str, Any]) -> threading.Semaphore:
+    """Build the API concurrency limiter from sfx_generation.max_concurrent_api"""
+    return threading.Semaphore(max(1, int(config.get("sfx_generation", {}).get("max_concurrent_api", 3))))
+
+
+api_semaphore = create_api_semaphore(CONFIG)
+API_THROTTLE_SECONDS = 30
+api_serial_lock = threading.Lock()
+api_throttled_until: float = 0
+
+# /trigger work is handed to a fixed set of worker threads through a bounded
+# queue; when the queue is full new requests are rejected instead of piling up.
+# This relies on SocketIO's threading mode: request threads block on the
+# result and workers emit play_sfx directly.
+GENERATION_QUEUE: queue.Queue = queue.Queue(maxsize=64)
+GENERATION_WORKERS = max(4, os.cpu_count() or 4)
+SYNC_TRIGGER_TIMEOUT = 75  # API timeout plus time spent waiting in the queue
+generation_workers_started = False
+generation_workers_lock = threading.Lock()
+
+# Filenames of generated SFX in the audio cache
+GENERATED_AUDIO_RE = re.compile(r"^gen_[0-9a-f]{8,}\.mp3$")
+
+# play_sfx events produced within this window are sent as one play_sfx_batch
+EMIT_BATCH_WINDOW = 0.05
+pending_emits: list = []
+pending_emits_lock = threading.Lock()
+emit_flush_pending = False
+
+# Sender name used for startup/reload cache warming
+PRELOAD_SENDER = "__preload__"
+
+# Generations currently in progress, keyed by cache key, so duplicates share one call
+inflight_generations: Dict[str, Future] = {}
+inflight_lock = threading.Lock()
 
 
 class ElevenLabsError(Exception):
@@ -106,19 +257,98 @@ class ElevenLabsError(Exception):
     pass
 
 
-def get_local_sfx_files() -> Dict[str, Path]:
-    """Get all local SFX files from the library"""
+def scan_local_sfx_files() -> Dict[str, Path]:
+    """Scan the library folder for SFX files"""
     sfx_files = {}
-    if SFX_LIBRARY_DIR.exists():
-        for file in SFX_LIBRARY_DIR.glob("*.mp3"):
-            # Key is filename without extension, lowercase for matching
-            sfx_files[file.stem.lower()] = file
+    for file in SFX_LIBRARY_DIR.glob("*.mp3"):
+        # Key is filename without extension, lowercase for matching
+        sfx_files[file.stem.lower()] = file
     return sfx_files
 
 
-def check_local_library(prompt: str) -> Optional[Path]:
+def get_local_sfx_files() -> Dict[str, Path]:
+    """Get all local SFX files from the library (rescanned only when the folder changes)"""
+    # The watcher keeps the index current, so no filesystem access is needed
+    if library_observer is not None:
+        return library_cache["files"]
+    
+    try:
+        mtime = SFX_LIBRARY_DIR.stat().st_mtime_ns
+    except OSError:
+        return {}
+    
+    with library_cache_lock:
+        if library_cache["mtime"] == mtime:
+            return library_cache["files"]
+        
+        sfx_files = scan_local_sfx_files()
+        
+        library_cache["mtime"] = mtime
+        library_cache["files"] = sfx_files
+        return sfx_files
+
+
+def update_library_index(removed: Optional[str] = None, added: Optional[str] = None):
+    """Apply a single file change to the library index (copy-on-write for lock-free readers)"""
+    with library_cache_lock:
+        sfx_files = dict(library_cache["files"])
+        
+        if removed:
+            path = Path(removed)
+            if sfx_files.get(path.stem.lower()) == path:
+                del sfx_files[path.stem.lower()]
+        
+        if added:
+            path = Path(added)
+            if path.suffix.lower() == ".mp3" and path.parent == SFX_LIBRARY_DIR:
+                sfx_files[path.stem.lower()] = path
+        
+        library_cache["files"] = sfx_files
+
+
+class LibraryEventHandler(FileSystemEventHandler):
+    """Keeps the library index in sync with file events in sfx_library"""
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            update_library_index(added=event.src_path)
+    
+    def on_deleted(self, event):
+        if not event.is_directory:
+            update_library_index(removed=event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            update_library_index(removed=event.src_path, added=event.dest_path)
+
+
+def start_library_watcher():
+    """Seed the library index and start watching sfx_library for changes"""
+    global library_observer
+    
+    if Observer is None:
+        logger.info("watchdog not installed, local library is rescanned when it changes")
+        return
+    
+    try:
+        observer = Observer()
+        observer.schedule(LibraryEventHandler(), str(SFX_LIBRARY_DIR), recursive=False)
+        observer.start()
+    except Exception as e:
+        logger.warning(f"Could not watch local library, falling back to rescans: {e}")
+        return
+    
+    # Seed after the observer starts so no change can slip in between
+    with library_cache_lock:
+        library_cache["files"] = scan_local_sfx_files()
+        library_observer = observer
+
+
+def check_local_library(prompt: str, config: Optional[Dict[str, Any]] = None) -> Optional[Path]:
     """Check if prompt matches a local SFX file"""
-    if not CONFIG.get("sfx_generation", {}).get("enable_local_library", True):
+    if config is None:
+        config = CONFIG
+    if not config.get("sfx_generation", {}).get("enable_local_library", True):
         return None
     
     sfx_files = get_local_sfx_files()
@@ -132,38 +362,280 @@ def check_local_library(prompt: str) -> Optional[Path]:
     return None
 
 
+def write_json_atomic(filepath: Path, data: Dict[str, Any]):
+    """Write a small JSON file via temp file + rename so readers never see partial data"""
+    tmp_path = filepath.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, filepath)
+    except OSError as e:
+        logger.debug(f"Could not write {filepath.name}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+# MPEG audio frame header tables, indexed by [version][layer][bitrate_index] (kbps)
+MPEG_BITRATES = {
+    "1": {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    "2": {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+MPEG_SAMPLE_RATES = {
+    "1": [44100, 48000, 32000],
+    "2": [22050, 24000, 16000],
+    "2.5": [11025, 12000, 8000],
+}
+MPEG_VERSIONS = {0b00: "2.5", 0b10: "2", 0b11: "1"}
+MPEG_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+
+def parse_mpeg_header(header: bytes) -> Optional[Dict[str, int]]:
+    """Decode a 4-byte MPEG audio frame header, or None if it isn't one"""
+    value = int.from_bytes(header, "big")
+    if (value >> 21) & 0x7FF != 0x7FF:
+        return None
+    
+    version = MPEG_VERSIONS.get((value >> 19) & 0b11)
+    layer = MPEG_LAYERS.get((value >> 17) & 0b11)
+    bitrate_index = (value >> 12) & 0b1111
+    sample_rate_index = (value >> 10) & 0b11
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    
+    table_version = "1" if version == "1" else "2"
+    is_mono = (value >> 6) & 0b11 == 0b11
+    
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 3 and version != "1":
+        samples_per_frame = 576
+    else:
+        samples_per_frame = 1152
+    
+    # Layer III side info sits between the header and a Xing/Info tag
+    if version == "1":
+        side_info_size = 17 if is_mono else 32
+    else:
+        side_info_size = 9 if is_mono else 17
+    
+    return {
+        "bitrate": MPEG_BITRATES[table_version][layer][bitrate_index] * 1000,
+        "sample_rate": MPEG_SAMPLE_RATES[version][sample_rate_index],
+        "samples_per_frame": samples_per_frame,
+        "side_info_size": side_info_size,
+    }
+
+
+def read_frame_count(first_frame: bytes, side_info_size: int) -> Optional[int]:
+    """Read the total frame count from a Xing/Info or VBRI tag in the first frame"""
+    xing_offset = 4 + side_info_size
+    if first_frame[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(first_frame[xing_offset + 4:xing_offset + 8], "big")
+        if flags & 0x1:
+            return int.from_bytes(first_frame[xing_offset + 8:xing_offset + 12], "big")
+        return None
+    
+    if first_frame[36:40] == b"VBRI":
+        return int.from_bytes(first_frame[50:54], "big")
+    
+    return None
+
+
+def read_mp3_duration(filepath: Path) -> Optional[float]:
+    """
+    Compute an MP3's duration from its first frame header instead of scanning
+    the file. Uses the Xing/VBRI frame count when present, otherwise assumes
+    constant bitrate. Returns None if it can't tell, so the caller can fall
+    back to mutagen.
+    """
+    with open(filepath, "rb") as f:
+        file_size = f.seek(0, os.SEEK_END)
+        f.seek(0)
+        head = f.read(10)
+        
+        # Skip an ID3v2 tag (size is a 28-bit syncsafe integer, plus footer if flagged)
+        audio_start = 0
+        if len(head) == 10 and head[:3] == b"ID3":
+            size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            audio_start = 10 + size + (10 if head[5] & 0x10 else 0)
+        
+        # Find the first frame sync within a small window
+        f.seek(audio_start)
+        window = f.read(4096)
+        
+        audio_end = file_size
+        if file_size >= 128:
+            f.seek(file_size - 128)
+            if f.read(3) == b"TAG":
+                audio_end -= 128  # ID3v1 tag
+    
+    for offset in range(len(window) - 3):
+        if window[offset] != 0xFF:
+            continue
+        frame = parse_mpeg_header(window[offset:offset + 4])
+        if frame is None:
+            continue
+        
+        first_frame = window[offset:offset + 64]
+        frame_count = read_frame_count(first_frame, frame["side_info_size"])
+        if frame_count:
+            return frame_count * frame["samples_per_frame"] / frame["sample_rate"]
+        
+        # A VBR tag without a usable frame count - let mutagen work it out
+        if b"Xing" in first_frame or b"VBRI" in first_frame:
+            return None
+        
+        audio_bytes = audio_end - (audio_start + offset)
+        return audio_bytes * 8 / frame["bitrate"]
+    
+    return None
+
+
 def get_audio_duration(filepath: Path) -> float:
     """Get duration of an MP3 file in seconds"""
     try:
-        audio = MP3(str(filepath))
-        return audio.info.length
-    except Exception as e:
+        stat = filepath.stat()
+    except OSError as e:
         logger.warning(f"Could not get audio duration: {e}")
         return 10.0  # Default fallback
+    
+    return read_audio_duration(str(filepath), stat.st_mtime_ns, stat.st_size)
 
 
-def generate_elevenlabs_sfx(prompt: str) -> tuple[bytes, float]:
+def get_sidecar_path(filepath: Path) -> Path:
+    """Duration sidecar for an audio file, e.g. meta/sfx_library/Doom.json"""
+    return AUDIO_META_DIR / filepath.parent.name / f"{filepath.stem}.json"
+
+
+@functools.lru_cache(maxsize=512)
+def read_audio_duration(path: str, mtime_ns: int, size: int) -> float:
     """
-    Generate SFX using ElevenLabs API
-    Returns: (audio_data, duration_seconds)
+    Read duration from the file's .json sidecar, or parse the MP3 and write one.
+    Memoized per (path, mtime, size) so unchanged files skip disk entirely.
     """
-    api_key = CONFIG.get("elevenlabs_api_key", "")
-    if not api_key or api_key == "YOUR_ELEVENLABS_API_KEY_HERE":
-        raise ElevenLabsError("API_KEY_NOT_CONFIGURED")
+    filepath = Path(path)
+    sidecar = get_sidecar_path(filepath)
     
-    sfx_config = CONFIG.get("sfx_generation", {})
+    try:
+        with open(sidecar, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("mtime_ns") == mtime_ns and metadata.get("size") == size:
+            return float(metadata["duration"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    
+    try:
+        duration = read_mp3_duration(filepath)
+        if duration is None:
+            audio = MP3(path)
+            duration = audio.info.length
+    except Exception as e:
+        logger.warning(f"Could not get audio duration: {e}")
+        return 10.0  # Default fallback
+    
+    write_json_atomic(sidecar, {"duration": duration, "mtime_ns": mtime_ns, "size": size})
+    return duration
+
+
+def get_generation_settings(config: Optional[Dict[str, Any]] = None) -> Tuple[int, float]:
+    """Get (max_duration, prompt_influence) from config, clamped to API limits"""
+    if config is None:
+        config = CONFIG
+    sfx_config = config.get("sfx_generation", {})
     max_duration = sfx_config.get("max_duration", 20)
     prompt_influence = sfx_config.get("prompt_influence", 0.5)
     
     # Clamp values
     max_duration = max(1, min(22, max_duration))  # ElevenLabs max is 22 seconds
     prompt_influence = max(0.0, min(1.0, prompt_influence))
+    return max_duration, prompt_influence
+
+
+def cache_key(prompt: str, max_duration: float, prompt_influence: float) -> str:
+    """Deterministic cache key for a generation request"""
+    raw = f"{prompt.lower().strip()}|{max_duration}|{prompt_influence}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def get_cache_path(key: str) -> Path:
+    """Path of the generated SFX for a cache key"""
+    return AUDIO_CACHE_DIR / f"gen_{key}.mp3"
+
+
+def get_cached_sfx(key: str) -> Optional[Tuple[Path, float]]:
+    """
+    Look up a previously generated SFX in the audio cache
+    Returns: (filepath, duration_seconds) or None on cache miss
+    """
+    filepath = get_cache_path(key)
+    try:
+        file_age = time.time() - filepath.stat().st_mtime
+    except OSError:
+        return None
+    
+    duration = get_audio_duration(filepath)
+    
+    # Refresh mtime so frequently used sounds survive cache cleanup
+    # (at most hourly, so the duration memo stays warm in between)
+    if file_age > 3600:
+        try:
+            os.utime(filepath)
+        except OSError:
+            pass
+    
+    return filepath, duration
+
+
+def post_elevenlabs(url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> requests.Response:
+    """
+    POST to ElevenLabs within the concurrency limit, one at a time while throttled.
+    The response is streamed, so callers must close it (use it as a context manager).
+    """
+    global api_throttled_until
+    
+    with api_semaphore:
+        if time.time() < api_throttled_until:
+            with api_serial_lock:
+                response = HTTP_SESSION.post(url, headers=headers, json=payload, timeout=60, stream=True)
+        else:
+            response = HTTP_SESSION.post(url, headers=headers, json=payload, timeout=60, stream=True)
+        
+        if response.status_code == 429:
+            try:
+                backoff = float(response.headers.get("Retry-After", API_THROTTLE_SECONDS))
+            except ValueError:
+                backoff = API_THROTTLE_SECONDS
+            api_throttled_until = time.time() + backoff
+            logger.warning(f"ElevenLabs rate limited, serializing API calls for {backoff:.0f}s")
+    
+    return response
+
+
+def generate_elevenlabs_sfx(prompt: str, filepath: Path, config: Dict[str, Any]) -> Path:
+    """
+    Generate SFX using ElevenLabs API, streaming the audio to filepath as it arrives.
+    config must be the same snapshot the cache key was built from.
+    Returns: filepath
+    """
+    api_key = config.get("elevenlabs_api_key", "")
+    if not api_key or api_key == "YOUR_ELEVENLABS_API_KEY_HERE":
+        raise ElevenLabsError("API_KEY_NOT_CONFIGURED")
+    
+    max_duration, prompt_influence = get_generation_settings(config)
     
     url = "https://api.elevenlabs.io/v1/sound-generation"
     
+    # Content-Type is set on the session; the key is per-request so config reloads apply
     headers = {
-        "xi-api-key": api_key,
-        "Content-Type": "application/json"
+        "xi-api-key": api_key
     }
     
     payload = {
@@ -175,25 +647,31 @@ def generate_elevenlabs_sfx(prompt: str) -> tuple[bytes, float]:
     logger.info(f"Generating SFX: '{prompt}' (duration: {max_duration}s, influence: {prompt_influence})")
     
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        
-        if response.status_code == 200:
-            audio_data = response.content
-            # Estimate duration (actual duration determined after save)
-            return audio_data, max_duration
-        elif response.status_code == 401:
-            raise ElevenLabsError("INVALID_API_KEY")
-        elif response.status_code == 429:
-            # Check if it's rate limit or quota
-            error_text = response.text.lower()
-            if "quota" in error_text or "limit" in error_text:
-                raise ElevenLabsError("QUOTA_EXCEEDED")
-            raise ElevenLabsError("RATE_LIMITED")
-        elif response.status_code == 400:
-            raise ElevenLabsError("INVALID_PROMPT")
-        else:
-            error_msg = response.text[:100] if response.text else "Unknown error"
-            raise ElevenLabsError(f"API_ERROR_{response.status_code}: {error_msg}")
+        with post_elevenlabs(url, headers, payload) as response:
+            if response.status_code == 200:
+                # Write to a temp file first so readers never see a partial MP3
+                tmp_path = filepath.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+                try:
+                    with open(tmp_path, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            f.write(chunk)
+                    os.replace(tmp_path, filepath)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+                return filepath
+            elif response.status_code == 401:
+                raise ElevenLabsError("INVALID_API_KEY")
+            elif response.status_code == 429:
+                # Check if it's rate limit or quota
+                error_text = response.text.lower()
+                if "quota" in error_text or "limit" in error_text:
+                    raise ElevenLabsError("QUOTA_EXCEEDED")
+                raise ElevenLabsError("RATE_LIMITED")
+            elif response.status_code == 400:
+                raise ElevenLabsError("INVALID_PROMPT")
+            else:
+                error_msg = response.text[:100] if response.text else "Unknown error"
+                raise ElevenLabsError(f"API_ERROR_{response.status_code}: {error_msg}")
             
     except requests.exceptions.Timeout:
         raise ElevenLabsError("TIMEOUT")
@@ -201,13 +679,50 @@ def generate_elevenlabs_sfx(prompt: str) -> tuple[bytes, float]:
         raise ElevenLabsError(f"NETWORK_ERROR: {e}")
 
 
-def process_sfx_request(prompt: str, sender: str) -> Dict[str, Any]:
+def generate_cached_sfx(key: str, prompt: str, config: Dict[str, Any]) -> Tuple[Path, float]:
     """
-    Process an SFX request - check local library or generate via API
-    Returns dict with audio_url, duration, is_local, etc.
+    Generate an SFX into the cache, coalescing concurrent requests for the same key
+    so only one API call is made. Raises ElevenLabsError on failure.
+    Returns: (filepath, duration_seconds)
+    """
+    with inflight_lock:
+        future = inflight_generations.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            inflight_generations[key] = future
+    
+    if not is_owner:
+        logger.info(f"Waiting on in-flight generation for '{prompt}'")
+        return future.result()
+    
+    try:
+        # Another request may have finished generating just before we registered
+        result = get_cached_sfx(key)
+        if not result:
+            filepath = generate_elevenlabs_sfx(prompt, get_cache_path(key), config)
+            
+            # Also writes the duration sidecar used by later cache hits
+            result = filepath, get_audio_duration(filepath)
+            
+            logger.info(f"Generated SFX saved: {result[0].name} ({result[1]:.1f}s)")
+        future.set_result(result)
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        with inflight_lock:
+            inflight_generations.pop(key, None)
+    
+    return future.result()
+
+
+def lookup_sfx(prompt: str, sender: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Resolve an SFX request from the local library or the generation cache
+    without calling the API. Returns the result dict, or None on a miss.
     """
     # Check local library first
-    local_file = check_local_library(prompt)
+    local_file = check_local_library(prompt, config)
     
     if local_file:
         # Use local file - serve directly without caching
@@ -221,62 +736,274 @@ def process_sfx_request(prompt: str, sender: str) -> Dict[str, Any]:
             "prompt": prompt,
             "sender": sender
         }
-    else:
-        # Generate via ElevenLabs
+    
+    # Check the generation cache before calling the API
+    cached = get_cached_sfx(cache_key(prompt, *get_generation_settings(config)))
+    
+    if cached:
+        filepath, duration = cached
+        logger.info(f"Cached SFX hit: {filepath.name} ({duration:.1f}s)")
+        
+        return {
+            "success": True,
+            "audio_url": f"/audio/generated/{filepath.name}",
+            "duration": duration,
+            "is_local": False,
+            "prompt": prompt,
+            "sender": sender
+        }
+    
+    return None
+
+
+def process_sfx_request(prompt: str, sender: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Process an SFX request - check local library or generate via API
+    Returns dict with audio_url, duration, is_local, etc.
+    """
+    # One config snapshot for the whole request, so the cache key always
+    # matches the settings the audio is generated with
+    if config is None:
+        config = CONFIG
+    
+    result = lookup_sfx(prompt, sender, config)
+    if result:
+        return result
+    
+    # Generate via ElevenLabs (shared with any identical request already in flight)
+    key = cache_key(prompt, *get_generation_settings(config))
+    try:
+        filepath, actual_duration = generate_cached_sfx(key, prompt, config)
+        
+        return {
+            "success": True,
+            "audio_url": f"/audio/generated/{filepath.name}",
+            "duration": actual_duration,
+            "is_local": False,
+            "prompt": prompt,
+            "sender": sender
+        }
+        
+    except ElevenLabsError as e:
+        logger.error(f"ElevenLabs error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "prompt": prompt,
+            "sender": sender
+        }
+
+
+def generation_worker():
+    """Worker thread: process queued SFX requests forever"""
+    while True:
+        prompt, sender, config, future = GENERATION_QUEUE.get()
         try:
-            audio_data, estimated_duration = generate_elevenlabs_sfx(prompt)
-            
-            # Save to cache
-            filename = f"gen_{uuid.uuid4().hex[:8]}.mp3"
-            filepath = AUDIO_CACHE_DIR / filename
-            
-            with open(filepath, "wb") as f:
-                f.write(audio_data)
-            
-            # Get actual duration
-            actual_duration = get_audio_duration(filepath)
-            
-            logger.info(f"Generated SFX saved: {filename} ({actual_duration:.1f}s)")
-            
-            return {
-                "success": True,
-                "audio_url": f"/audio/generated/{filename}",
-                "duration": actual_duration,
-                "is_local": False,
-                "prompt": prompt,
-                "sender": sender
-            }
-            
-        except ElevenLabsError as e:
-            logger.error(f"ElevenLabs error: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "prompt": prompt,
-                "sender": sender
-            }
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(process_sfx_request(prompt, sender, config))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            GENERATION_QUEUE.task_done()
+
+
+def submit_sfx_request(prompt: str, sender: str, config: Dict[str, Any]) -> Optional[Future]:
+    """Queue an SFX request for the workers. Returns None if the queue is full."""
+    global generation_workers_started
+    
+    if not generation_workers_started:
+        with generation_workers_lock:
+            if not generation_workers_started:
+                for i in range(GENERATION_WORKERS):
+                    threading.Thread(target=generation_worker, name=f"sfx-worker-{i}", daemon=True).start()
+                generation_workers_started = True
+    
+    future = Future()
+    try:
+        GENERATION_QUEUE.put_nowait((prompt, sender, config, future))
+    except queue.Full:
+        return None
+    return future
+
+
+def preload_prompts():
+    """Generate the configured preload_prompts into the cache in the background"""
+    sfx_config = CONFIG.get("sfx_generation", {})
+    prompts = [p.strip() for p in sfx_config.get("preload_prompts", []) if isinstance(p, str) and p.strip()]
+    if not prompts:
+        return
+    
+    api_key = CONFIG.get("elevenlabs_api_key", "")
+    if not api_key or api_key == "YOUR_ELEVENLABS_API_KEY_HERE":
+        logger.info("Skipping SFX preload: ElevenLabs API key not set")
+        return
+    
+    def run():
+        # Results are only cached, never emitted to widgets
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="sfx-preload") as executor:
+            results = list(executor.map(lambda p: process_sfx_request(p, PRELOAD_SENDER), prompts))
+        loaded = sum(1 for result in results if result["success"])
+        logger.info(f"Preloaded {loaded}/{len(prompts)} SFX prompt(s)")
+    
+    logger.info(f"Preloading {len(prompts)} SFX prompt(s) in the background")
+    threading.Thread(target=run, name="sfx-preload", daemon=True).start()
 
 
-def cleanup_old_cache(max_age_hours: int = 24):
-    """Clean up old generated audio files (only cache AI-generated files now)"""
+def cleanup_old_cache(max_age_hours: int = 24, max_deletions: int = CLEANUP_BATCH_SIZE) -> bool:
+    """
+    Clean up old generated audio files (only cache AI-generated files now).
+    Deletes at most max_deletions files and paces unlinks to stay within
+    CLEANUP_BYTES_PER_SECOND. Returns True if the batch limit was reached.
+    """
     now = time.time()
     max_age_seconds = max_age_hours * 3600
     cleaned_count = 0
+    bytes_deleted = 0
+    started = time.monotonic()
+    batch_full = False
     
-    for file in AUDIO_CACHE_DIR.glob("*.mp3"):
-        # Only clean generated files (gen_*) and old local files from previous versions (local_*)
-        if file.name.startswith("gen_") or file.name.startswith("local_"):
-            file_age = now - file.stat().st_mtime
-            if file_age > max_age_seconds:
-                try:
-                    file.unlink()
-                    cleaned_count += 1
-                    logger.debug(f"Cleaned up old cache file: {file.name}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete cache file {file.name}: {e}")
+    with os.scandir(AUDIO_CACHE_DIR) as entries:
+        for entry in entries:
+            # Only clean generated files (gen_*), old local files from previous versions (local_*)
+            # and temp files left behind by interrupted writes
+            name = entry.name
+            if not name.startswith(("gen_", "local_")) or not name.endswith((".mp3", ".tmp")):
+                continue
+            
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime <= max_age_seconds:
+                continue
+            
+            try:
+                os.unlink(entry.path)
+                if name.endswith(".mp3"):
+                    get_sidecar_path(Path(entry.path)).unlink(missing_ok=True)
+                cleaned_count += 1
+                bytes_deleted += stat.st_size
+                logger.debug(f"Cleaned up old cache file: {name}")
+            except Exception as e:
+                logger.warning(f"Failed to delete cache file {name}: {e}")
+            
+            if cleaned_count >= max_deletions:
+                batch_full = True
+                break
+            
+            # Stay within the I/O budget so slow disks aren't flooded
+            ahead = bytes_deleted / CLEANUP_BYTES_PER_SECOND - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
     
     if cleaned_count > 0:
         logger.info(f"Cache cleanup: removed {cleaned_count} old files")
+    
+    return batch_full
+
+
+def schedule_cache_cleanup(delay: float = CLEANUP_INTERVAL_SECONDS):
+    """Run a cache cleanup pass on a background timer"""
+    timer = threading.Timer(delay, run_cache_cleanup)
+    timer.daemon = True
+    timer.start()
+
+
+def run_cache_cleanup():
+    """Timer callback: clean one batch, then schedule the next pass"""
+    batch_full = False
+    try:
+        batch_full = cleanup_old_cache()
+    except Exception as e:
+        logger.warning(f"Cache cleanup failed: {e}")
+    
+    # Come back sooner if there were more files than one batch allows
+    schedule_cache_cleanup(CLEANUP_BACKLOG_DELAY if batch_full else CLEANUP_INTERVAL_SECONDS)
+
+
+def parse_prompt(raw: str, encoded: str) -> str:
+    """Get the request prompt, preferring the base64 encoded form when given"""
+    # Check for base64 encoded prompt first, then fall back to raw prompt
+    encoded = encoded.strip()
+    if encoded:
+        try:
+            return base64.b64decode(encoded).decode('utf-8').strip()
+        except Exception as e:
+            logger.warning(f"Failed to decode base64 prompt: {e}")
+            return ""
+    return raw.strip()
+
+
+def emit_sfx(result: Dict[str, Any]):
+    """Send a successful SFX result to all connected widget clients"""
+    global last_play_time
+    
+    # Update last play time
+    last_play_time = time.time()
+    
+    # Emit to all connected widget clients
+    overlay_config = CONFIG.get("overlay", {})
+    
+    emit_data = {
+        "audio_url": result["audio_url"],
+        "duration": result["duration"],
+        "prompt": result["prompt"] if overlay_config.get("show_prompt", True) else "",
+        "sender": result["sender"] if overlay_config.get("show_sender", True) else "",
+        "show_overlay": overlay_config.get("enabled", True),
+        "display_duration_after_audio": overlay_config.get("display_duration_after_audio", 2000)
+    }
+    
+    # Queue for the next batch window instead of emitting right away
+    global emit_flush_pending
+    with pending_emits_lock:
+        pending_emits.append(emit_data)
+        if emit_flush_pending:
+            return
+        emit_flush_pending = True
+    
+    # Flush from a timer thread; emitting off the request thread is safe
+    # because SocketIO runs in threading mode
+    try:
+        timer = threading.Timer(EMIT_BATCH_WINDOW, flush_pending_emits)
+        timer.daemon = True
+        timer.start()
+    except Exception as e:
+        logger.error(f"Could not schedule SFX emit batch, sending now: {e}")
+        flush_pending_emits()
+
+
+def flush_pending_emits():
+    """Emit everything queued during the batch window in a single message"""
+    global emit_flush_pending
+    with pending_emits_lock:
+        batch = pending_emits[:]
+        pending_emits.clear()
+        emit_flush_pending = False
+    
+    if not batch:
+        return
+    
+    # A lone event keeps the plain play_sfx message so custom overlays keep working
+    if len(batch) == 1:
+        socketio.emit("play_sfx", batch[0], room=WIDGET_ROOM)
+    else:
+        socketio.emit("play_sfx_batch", batch, room=WIDGET_ROOM)
+    logger.info(f"{len(batch)} SFX emitted to {len(connected_clients)} client(s)")
+
+
+def handle_queued_result(future: Future, request_id: str):
+    """Completion callback for queued /trigger requests"""
+    try:
+        result = future.result()
+    except Exception as e:
+        logger.error(f"Queued SFX request {request_id} failed: {e}")
+        return
+    
+    if result["success"]:
+        emit_sfx(result)
+    else:
+        logger.warning(f"Queued SFX request {request_id} failed: {result.get('error')}")
 
 
 # Flask Routes
@@ -323,41 +1050,28 @@ def trigger_sfx():
     - duration: float (audio duration in seconds)
     - durationMs: int (duration in milliseconds for Streamer.bot Delay)
     - error: string (if failed, contains error code)
-    """
-    global last_play_time
     
+    Pass sync=0 (query param or JSON field) to queue the request instead:
+    responds 202 with queued: true and request_id, and the widget plays the
+    sound once it is ready. The default comes from sfx_generation.sync_trigger.
+    Local library and cached sounds are always answered immediately.
+    
+    Responds 503 with error QUEUE_FULL when too many requests are pending.
+    """
     # Parse input from GET query params or POST JSON body
     if request.method == "GET":
-        # Check for base64 encoded prompt first, then fall back to raw prompt
-        encoded_prompt = request.args.get("encodedPrompt", "").strip()
-        if encoded_prompt:
-            try:
-                import base64
-                prompt = base64.b64decode(encoded_prompt).decode('utf-8').strip()
-            except Exception as e:
-                logger.warning(f"Failed to decode base64 prompt: {e}")
-                prompt = ""
-        else:
-            prompt = request.args.get("prompt", "").strip()
+        prompt = parse_prompt(request.args.get("prompt", ""), request.args.get("encodedPrompt", ""))
         sender = request.args.get("sender", "Anonymous").strip()
+        sync_param = request.args.get("sync")
     else:
         try:
             data = request.json or {}
         except:
             data = {}
         
-        # Check for base64 encoded prompt first, then fall back to raw prompt
-        encoded_prompt = data.get("encodedPrompt", "").strip()
-        if encoded_prompt:
-            try:
-                import base64
-                prompt = base64.b64decode(encoded_prompt).decode('utf-8').strip()
-            except Exception as e:
-                logger.warning(f"Failed to decode base64 prompt: {e}")
-                prompt = ""
-        else:
-            prompt = data.get("prompt", "").strip()
+        prompt = parse_prompt(data.get("prompt", ""), data.get("encodedPrompt", ""))
         sender = data.get("sender", "Anonymous").strip()
+        sync_param = data.get("sync")
     
     # Handle empty prompt
     if not prompt:
@@ -372,27 +1086,54 @@ def trigger_sfx():
     
     logger.info(f"SFX request from {sender}: '{prompt}'")
     
-    # Process the request (synchronous - waits for generation)
-    result = process_sfx_request(prompt, sender)
+    config = CONFIG
+    if sync_param is None:
+        sync = config.get("sfx_generation", {}).get("sync_trigger", True)
+    else:
+        sync = str(sync_param).strip().lower() in ("1", "true", "yes")
     
-    if result["success"]:
-        # Update last play time
-        last_play_time = time.time()
-        
-        # Emit to all connected widget clients
-        overlay_config = CONFIG.get("overlay", {})
+    # Local library and cache hits are answered right here; only cache misses
+    # wait in the worker queue for ElevenLabs
+    result = lookup_sfx(prompt, sender, config)
+    
+    if result is None:
+        future = submit_sfx_request(prompt, sender, config)
+        if future is None:
+            logger.warning(f"SFX queue full, rejecting request from {sender}: '{prompt}'")
+            return jsonify({
+                "success": False,
+                "error": "QUEUE_FULL",
+                "prompt": prompt,
+                "sender": sender,
+                "duration": 0,
+                "durationMs": 0
+            }), 503
         
-        emit_data = {
-            "audio_url": result["audio_url"],
-            "duration": result["duration"],
-            "prompt": result["prompt"] if overlay_config.get("show_prompt", True) else "",
-            "sender": result["sender"] if overlay_config.get("show_sender", True) else "",
-            "show_overlay": overlay_config.get("enabled", True),
-            "display_duration_after_audio": overlay_config.get("display_duration_after_audio", 2000)
-        }
+        if not sync:
+            # Return immediately; the widget plays it when ready
+            request_id = uuid.uuid4().hex[:8]
+            future.add_done_callback(lambda f: handle_queued_result(f, request_id))
+            
+            return jsonify({
+                "success": True,
+                "queued": True,
+                "request_id": request_id,
+                "prompt": prompt,
+                "sender": sender,
+                "duration": 0,
+                "durationMs": 0
+            }), 202
         
-        socketio.emit("play_sfx", emit_data)
-        logger.info(f"SFX emitted to {len(connected_clients)} client(s)")
+        # Wait for the worker to finish (synchronous - waits for generation)
+        try:
+            result = future.result(timeout=SYNC_TRIGGER_TIMEOUT)
+        except FutureTimeoutError:
+            # Skip the job if it hasn't started yet; nobody is waiting for it anymore
+            future.cancel()
+            result = {"success": False, "error": "TIMEOUT"}
+    
+    if result["success"]:
+        emit_sfx(result)
         
         duration = result["duration"]
         return jsonify({
@@ -415,68 +1156,70 @@ def trigger_sfx():
         })
 
 
-@app.route("/audio/<path:filename>")
-def serve_audio(filename):
-    """Serve audio files - route to local or generated based on filename"""
+def send_audio_file(directory: Path, filename: str, max_age: int = 0):
+    """
+    Serve an MP3 from a directory with conditional and range request support,
+    so overlay reloads get 304s instead of re-downloading the file
+    """
     # Security: only allow mp3 files
     if not filename.endswith(".mp3"):
         return "Invalid file type", 400
     
-    # Check if it's a local file (no hash in filename)
-    if not any(char in filename for char in ['_', '-']) or len(filename.split('_')[0]) < 10:
-        # Likely a local file - serve directly from sfx_library
-        local_path = SFX_LIBRARY_DIR / filename
-        if local_path.exists():
-            return send_file(local_path, mimetype="audio/mpeg")
+    # Security: reject anything that would resolve outside the directory
+    safe_path = safe_join(str(directory), filename)
+    if safe_path is None:
+        return "File not found", 404
     
-    # Generated file - serve from cache
-    cache_path = AUDIO_CACHE_DIR / filename
-    if not cache_path.exists():
+    filepath = Path(safe_path)
+    if not filepath.is_file():
         return "File not found", 404
     
-    return send_file(cache_path, mimetype="audio/mpeg")
+    return send_file(filepath,
+                     mimetype="audio/mpeg",
+                     conditional=True,
+                     etag=True,
+                     last_modified=filepath.stat().st_mtime,
+                     max_age=max_age)
+
+
+@app.route("/audio/<path:filename>")
+def serve_audio(filename):
+    """Serve audio files - route to local or generated based on filename"""
+    # Generated files are named gen_<cache key>.mp3 - serve from cache
+    if GENERATED_AUDIO_RE.match(filename):
+        return send_audio_file(AUDIO_CACHE_DIR, filename, max_age=3600)
+    
+    # Anything else is a local file - serve directly from sfx_library
+    return send_audio_file(SFX_LIBRARY_DIR, filename)
 
 
 @app.route("/audio/local/<filename>")
 def serve_local_audio(filename):
     """Serve local SFX files directly from sfx_library"""
-    # Security: only allow mp3 files from sfx_library
-    if not filename.endswith(".mp3"):
-        return "Invalid file type", 400
-    
-    filepath = SFX_LIBRARY_DIR / filename
-    if not filepath.exists():
-        return "File not found", 404
-    
-    return send_file(filepath, mimetype="audio/mpeg")
+    # Library files can be replaced in place, so always revalidate
+    return send_audio_file(SFX_LIBRARY_DIR, filename)
 
 
 @app.route("/audio/generated/<filename>") 
 def serve_generated_audio(filename):
     """Serve generated SFX files from audio_cache"""
-    # Security: only allow mp3 files from audio_cache
-    if not filename.endswith(".mp3"):
-        return "Invalid file type", 400
-    
-    filepath = AUDIO_CACHE_DIR / filename
-    if not filepath.exists():
-        return "File not found", 404
-    
-    return send_file(filepath, mimetype="audio/mpeg")
+    # Generated files are named by cache key, so browsers may keep them for a while
+    return send_audio_file(AUDIO_CACHE_DIR, filename, max_age=3600)
 
 
 @app.route("/status")
 def status():
     """Health check / status endpoint"""
+    config = CONFIG
     return jsonify({
         "status": "running",
         "connected_clients": len(connected_clients),
         "local_sfx_count": len(get_local_sfx_files()),
         "config": {
-            "max_duration": CONFIG.get("sfx_generation", {}).get("max_duration", 20),
-            "prompt_influence": CONFIG.get("sfx_generation", {}).get("prompt_influence", 0.5),
-            "overlay_enabled": CONFIG.get("overlay", {}).get("enabled", True),
-            "local_library_enabled": CONFIG.get("sfx_generation", {}).get("enable_local_library", True)
+            "max_duration": config.get("sfx_generation", {}).get("max_duration", 20),
+            "prompt_influence": config.get("sfx_generation", {}).get("prompt_influence", 0.5),
+            "overlay_enabled": config.get("overlay", {}).get("enabled", True),
+            "local_library_enabled": config.get("sfx_generation", {}).get("enable_local_library", True)
         }
     })
 
@@ -496,20 +1239,27 @@ def list_sounds():
 @app.route("/config", methods=["GET"])
 def get_config():
     """Get current configuration (excluding API key)"""
-    safe_config = {k: v for k, v in CONFIG.items() if k != "elevenlabs_api_key"}
-    safe_config["elevenlabs_api_key"] = "***configured***" if CONFIG.get("elevenlabs_api_key", "").startswith("sk_") else "NOT SET"
+    config = CONFIG
+    safe_config = {k: v for k, v in config.items() if k != "elevenlabs_api_key"}
+    safe_config["elevenlabs_api_key"] = "***configured***" if config.get("elevenlabs_api_key", "").startswith("sk_") else "NOT SET"
     return jsonify(safe_config)
 
 
 @app.route("/reload-config", methods=["POST"])
 def reload_config():
     """Reload configuration from file"""
-    global CONFIG
+    global CONFIG, api_semaphore
     try:
-        CONFIG = load_config()
+        # Parse fully before swapping so readers only ever see a complete config
+        with CONFIG_LOCK:
+            new_config = read_config()
+            CONFIG = new_config
+            api_semaphore = create_api_semaphore(new_config)
         logger.info("Configuration reloaded")
+        preload_prompts()
         return jsonify({"success": True, "message": "Configuration reloaded"})
     except Exception as e:
+        logger.error(f"Configuration reload failed: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -517,8 +1267,15 @@ def reload_config():
 
 @socketio.on("connect")
 def handle_connect():
-    """Handle new WebSocket connection"""
+    """
+    Handle new WebSocket connection
+    
+    Clients are treated as overlay widgets unless they connect with a
+    different client_type query param (e.g. io({query: {client_type: "admin"}}))
+    """
     connected_clients.add(request.sid)
+    if request.args.get("client_type", "widget") == "widget":
+        join_room(WIDGET_ROOM)
     logger.info(f"Client connected: {request.sid} (total: {len(connected_clients)})")
 
 
@@ -535,18 +1292,46 @@ def handle_ping():
     emit("pong", {"timestamp": time.time()})
 
 
+def schedule_client_sweep():
+    """Periodically drop sids whose disconnect event was missed"""
+    timer = threading.Timer(SOCKETIO_PING_TIMEOUT, sweep_connected_clients)
+    timer.daemon = True
+    timer.start()
+
+
+def sweep_connected_clients():
+    """Timer callback: remove stale sids, then schedule the next sweep"""
+    try:
+        manager = socketio.server.manager
+        removed = connected_clients.sweep(lambda sid: manager.is_connected(sid, "/"),
+                                          min_age=SOCKETIO_PING_TIMEOUT)
+        if removed:
+            logger.info(f"Removed {removed} stale client(s) (total: {len(connected_clients)})")
+    except Exception as e:
+        logger.warning(f"Client sweep failed: {e}")
+    
+    schedule_client_sweep()
+
+
 # Startup tasks
 
-def get_lan_ip() -> str:
-    """Get the LAN IP address of this machine"""
+LAN_IP_TTL_SECONDS = 300
+
+
+def get_lan_ip() -> Optional[str]:
+    """Get the LAN IP address of this machine (cached for LAN_IP_TTL_SECONDS)"""
+    return lookup_lan_ip(int(time.time() // LAN_IP_TTL_SECONDS))
+
+
+@functools.lru_cache(maxsize=1)
+def lookup_lan_ip(ttl_bucket: int) -> Optional[str]:
+    """Look up the LAN IP; ttl_bucket changes every TTL so the cached value expires"""
     import socket
     try:
         # Connect to external address to determine which interface is used
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
     except Exception:
         return None
 
@@ -575,6 +1360,7 @@ def startup_tasks():
     logger.info(f"  Admin Panel: http://127.0.0.1:{port}/admin")
     logger.info("")
     logger.info("=" * 55)
+    start_library_watcher()
     logger.info(f"  Local SFX files: {len(get_local_sfx_files())}")
     
     # Validate API key
@@ -587,8 +1373,15 @@ def startup_tasks():
     logger.info("=" * 55)
     logger.info("")
     
-    # Clean up old cache
-    cleanup_old_cache()
+    # Clean up old cache in the background, then periodically while running
+    schedule_cache_cleanup(delay=0)
+    
+    # Warm the generation cache for frequently used prompts
+    preload_prompts()
+    
+    # Only a real SocketIO server can tell us which sids are still alive
+    if isinstance(socketio, SocketIO):
+        schedule_client_sweep()
 
 
 if __name__ == "__main__":